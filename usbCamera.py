@@ -2,13 +2,55 @@
 # -*- coding: UTF-8 -*-
 
 import cv2
+import numpy as np
 import os
 import time
 import logging
 import sys
-import pygame.camera
+import glob
+import re
+import ctypes
+import threading
+import weakref
+import concurrent.futures
+from pathlib import Path
 from rich.logging import RichHandler
 
+try:
+    import simplejpeg   # 基于 libjpeg-turbo 的 JPEG 编解码，速度优于 OpenCV 自带的 libjpeg
+except ImportError:
+    simplejpeg = None
+
+try:
+    import nvjpeg       # pynvjpeg, 基于 CUDA nvJPEG 的 GPU JPEG 编码
+except ImportError:
+    nvjpeg = None
+
+try:
+    import fcntl        # 仅 Linux/Unix 可用，用于 V4L2 ioctl 查询摄像头信息
+except ImportError:
+    fcntl = None
+
+try:
+    from pygrabber.dshow_graph import FilterGraph   # Windows DirectShow 设备枚举
+except ImportError:
+    FilterGraph = None
+
+try:
+    import numba        # JIT 编译预览画面的 overlay 合成
+except ImportError:
+    numba = None
+
+try:
+    import sdl2         # PySDL2, 预览窗口直接上传 BGR 纹理，绕过 HighGUI 的格式转换
+except ImportError:
+    sdl2 = None
+
+try:
+    import ffmpegcv     # 基于 ffmpeg 的视频采集，解码不占用调用线程
+except ImportError:
+    ffmpegcv = None
+
 
 def logging_init() -> None:
     """ logger初始化. """
@@ -23,34 +65,227 @@ def logging_init() -> None:
 
 def create_directory():
     """在脚本同级创建命名为Picture的目录, 然后脚本每次执行时会创建新的子目录, 并以时间戳来命名"""
-    main_dir = "Pictures"
-    current_dir = os.getcwd()
-    main_dir_path = os.path.join(current_dir, main_dir)
-    
-    # 如果主目录不存在，则创建它
-    if not os.path.exists(main_dir_path):
-        os.makedirs(main_dir_path)
-    
     # 获取当前时间，并格式化为字符串（年月日_时分秒）
     time_str = time.strftime("%Y%m%d_%H%M%S")
-    sub_dir_path = os.path.join(main_dir_path, time_str)
-    
-    # 创建子目录
-    os.makedirs(sub_dir_path)
-    return sub_dir_path
+    sub_dir_path = Path.cwd() / "Pictures" / time_str
+
+    # 一次性创建主目录与子目录，已存在时不报错
+    sub_dir_path.mkdir(parents=True, exist_ok=True)
+    return str(sub_dir_path)
+
+if numba is not None:
+    @numba.njit(cache=True, parallel=True, fastmath=True)
+    def composite_overlay(frame, overlay, mask):
+        """将 overlay 中 mask 为真的像素覆盖到 frame 上，按行并行。"""
+        height, width = mask.shape
+        for y in numba.prange(height):
+            for x in range(width):
+                if mask[y, x]:
+                    frame[y, x] = overlay[y, x]
+else:
+    def composite_overlay(frame, overlay, mask):
+        """将 overlay 中 mask 为真的像素覆盖到 frame 上。"""
+        frame[mask] = overlay[mask]
+
+
+class SDLPreviewWindow:
+    """基于 SDL2 streaming texture 的预览窗口，每帧只做一次 BGR 像素上传。"""
+
+    def __init__(self, title, width, height):
+        # 没有可用显示设备时初始化失败，由调用方退回 HighGUI
+        if sdl2.SDL_Init(sdl2.SDL_INIT_VIDEO) != 0:
+            raise RuntimeError(sdl2.SDL_GetError().decode(errors='replace'))
+        self.window = None
+        self.renderer = None
+        self.texture = None
+        self.size = None
+        self.event = sdl2.SDL_Event()
+        try:
+            self.window = sdl2.SDL_CreateWindow(title.encode(),
+                                                sdl2.SDL_WINDOWPOS_CENTERED, sdl2.SDL_WINDOWPOS_CENTERED,
+                                                width, height, sdl2.SDL_WINDOW_SHOWN)
+            self._check(self.window)
+            # flags 为 0，没有硬件加速时允许使用软件渲染器
+            self.renderer = sdl2.SDL_CreateRenderer(self.window, -1, 0)
+            self._check(self.renderer)
+            self._create_texture(width, height)
+        except RuntimeError:
+            self.close()
+            raise
+
+    @staticmethod
+    def _check(handle):
+        """SDL 创建失败时返回 NULL，转换为 RuntimeError。"""
+        if not handle:
+            raise RuntimeError(sdl2.SDL_GetError().decode(errors='replace'))
+
+    def _create_texture(self, width, height):
+        """按帧尺寸创建纹理，尺寸变化时重建。"""
+        if self.texture is not None:
+            sdl2.SDL_DestroyTexture(self.texture)
+            self.texture = None
+        self.texture = sdl2.SDL_CreateTexture(self.renderer, sdl2.SDL_PIXELFORMAT_BGR24,
+                                              sdl2.SDL_TEXTUREACCESS_STREAMING, width, height)
+        self._check(self.texture)
+        self.size = (width, height)
+
+    def show(self, frame):
+        """显示一帧 BGR 图像。"""
+        height, width = frame.shape[:2]
+        if self.size != (width, height):
+            self._create_texture(width, height)
+        frame = np.ascontiguousarray(frame)
+        sdl2.SDL_UpdateTexture(self.texture, None, frame.ctypes.data_as(ctypes.c_void_p), frame.strides[0])
+        sdl2.SDL_RenderCopy(self.renderer, self.texture, None, None)
+        sdl2.SDL_RenderPresent(self.renderer)
+
+    def poll_key(self):
+        """
+        非阻塞读取按键事件，与 cv2.waitKey 返回值保持一致。
+        关闭窗口视为按下 'q'，没有按键时返回 -1。
+        """
+        while sdl2.SDL_PollEvent(ctypes.byref(self.event)) != 0:
+            if self.event.type == sdl2.SDL_QUIT:
+                return ord('q')
+            if self.event.type == sdl2.SDL_KEYDOWN:
+                return self.event.key.keysym.sym
+        return -1
+
+    def close(self):
+        """销毁窗口并释放 SDL 资源。"""
+        # 创建失败的句柄为 NULL 指针，布尔值为 False
+        if self.texture:
+            sdl2.SDL_DestroyTexture(self.texture)
+        if self.renderer:
+            sdl2.SDL_DestroyRenderer(self.renderer)
+        if self.window:
+            sdl2.SDL_DestroyWindow(self.window)
+        sdl2.SDL_QuitSubSystem(sdl2.SDL_INIT_VIDEO)
+
+
+def encode_jpeg(frame, quality=95, gpu_encoder=None):
+    """
+    将 BGR 图像编码为 JPEG 字节流。
+    编码器优先级: GPU nvJPEG > simplejpeg > cv2.imencode
+    :param gpu_encoder: nvjpeg.NvJpeg 实例，为 None 时使用 CPU 编码
+    """
+    if gpu_encoder is not None:
+        try:
+            return gpu_encoder.encode(frame, quality)
+        except Exception as e:
+            logging.warning(f"GPU JPEG encode failed, fall back to CPU: {e}")
+    if simplejpeg is not None:
+        return simplejpeg.encode_jpeg(frame, quality=quality, colorspace='BGR', colorsubsampling='420')
+    _, jpeg_bytes = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return jpeg_bytes.tobytes()
+
+
+def jpeg_has_huffman_tables(data):
+    """检查 JPEG 数据在 SOS 之前是否包含 DHT (Huffman 表) 段。"""
+    pos = 2     # 跳过 SOI
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return False
+        marker = data[pos + 1]
+        if marker == 0xFF:      # 填充字节
+            pos += 1
+            continue
+        if marker == 0xC4:      # DHT
+            return True
+        if marker == 0xDA:      # SOS 之后为压缩数据
+            return False
+        pos += 2 + int.from_bytes(data[pos + 2:pos + 4], 'big')
+    return False
+
+
+def atomic_write(filename, data):
+    """先写入临时文件再替换，避免异步写入过程中出现不完整的图片文件。"""
+    tmp_filename = filename + '.tmp'
+    with open(tmp_filename, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_filename, filename)
+
+
+def save_jpeg(filename, frame, quality=95, gpu_encoder=None):
+    """将 BGR 图像编码为 JPEG 并保存。"""
+    atomic_write(filename, encode_jpeg(frame, quality=quality, gpu_encoder=gpu_encoder))
+
+
+def load_jpeg(filename):
+    """读取 JPEG 图像并解码为 BGR，优先使用 simplejpeg，不可用时退回 cv2.imread。"""
+    if simplejpeg is not None:
+        with open(filename, 'rb') as f:
+            return simplejpeg.decode_jpeg(f.read(), colorspace='BGR')
+    return cv2.imread(filename)
+
+
+class _V4L2Capability(ctypes.Structure):
+    """V4L2 struct v4l2_capability"""
+    _fields_ = [("driver", ctypes.c_char * 16),
+                ("card", ctypes.c_char * 32),
+                ("bus_info", ctypes.c_char * 32),
+                ("version", ctypes.c_uint32),
+                ("capabilities", ctypes.c_uint32),
+                ("device_caps", ctypes.c_uint32),
+                ("reserved", ctypes.c_uint32 * 3)]
+
+
+# _IOR('V', 0, struct v4l2_capability)
+VIDIOC_QUERYCAP = (2 << 30) | (ctypes.sizeof(_V4L2Capability) << 16) | (ord('V') << 8) | 0
+V4L2_CAP_VIDEO_CAPTURE = 0x00000001
+V4L2_CAP_DEVICE_CAPS = 0x80000000
+
+
+def list_cameras():
+    """
+    枚举设备上的摄像头。
+    Linux 下扫描 /dev/video* 并通过 VIDIOC_QUERYCAP 获取摄像头名称，过滤掉 metadata 等非采集节点；
+    Windows 下通过 DirectShow 获取设备列表；其它平台逐个尝试打开设备索引。
+    :return: [(设备索引, 摄像头名称), ...]
+    """
+    cameras = []
+    if sys.platform.startswith('linux') and fcntl is not None:
+        devices = sorted(glob.glob('/dev/video*'), key=lambda d: int(re.sub(r'\D', '', d) or 0))
+        for dev in devices:
+            match = re.fullmatch(r'/dev/video(\d+)', dev)
+            if match is None:
+                continue
+            cap = _V4L2Capability()
+            try:
+                fd = os.open(dev, os.O_RDWR | os.O_NONBLOCK)
+            except OSError:
+                continue
+            try:
+                fcntl.ioctl(fd, VIDIOC_QUERYCAP, cap)
+            except OSError:
+                continue
+            finally:
+                os.close(fd)
+            caps = cap.device_caps if cap.capabilities & V4L2_CAP_DEVICE_CAPS else cap.capabilities
+            if caps & V4L2_CAP_VIDEO_CAPTURE:
+                cameras.append((int(match.group(1)), f"{cap.card.decode(errors='replace')} ({dev})"))
+    elif sys.platform.startswith('win') and FilterGraph is not None:
+        cameras = list(enumerate(FilterGraph().get_input_devices()))
+    else:
+        for index in range(10):
+            camera = cv2.VideoCapture(index)
+            if camera.isOpened():
+                cameras.append((index, f"Camera {index}"))
+            camera.release()
+    return cameras
+
 
 def show_and_select_camera():
     """检测、显示可用摄像头，并返回手动所选择Camera的编号。
     
-    使用 pygame 来检测设备连接的摄像头列表，如果没有检测到摄像头，程序将打印提示信息并退出。
+    使用 list_cameras 来检测设备连接的摄像头列表，如果没有检测到摄像头，程序将打印提示信息并退出。
     如果检测到摄像头，函数将打印出可用的摄像头列表和对应的 ID。
     """
 
     try:
-        pygame.camera.init()     # 初始化 pygame 的摄像头模块
-        camera_list = pygame.camera.list_cameras()  # 获取设备上的摄像头列表
+        camera_list = list_cameras()  # 获取设备上的摄像头列表
     except Exception as e:
-        logging.error(f"Failed to initialize cameras or list cameras: {e}")
+        logging.error(f"Failed to list cameras: {e}")
         sys.exit(1) 
 
     if not camera_list:
@@ -61,36 +296,74 @@ def show_and_select_camera():
     cameras_num = len(cameras)
     logging.info(f"Available Cameras as follow, Please choose one: (range: [0-{cameras_num-1}])")
     logging.info('{:=>50}'.format(''))
-    for id, dev in cameras.items():
+    for id, (_, dev) in cameras.items():
         logging.info(f"{id} : {dev}")
     logging.info('{:=>50}'.format(''))
 
     index = int(input(f'Please select the camera index from [0-{cameras_num-1}]:'))
     if 0 <= index < cameras_num:
-        camera = cameras[index] 
+        device_index, camera = cameras[index]
         logging.info(f'You selection is: [ {index}: {camera} ]')
-        return index
+        return device_index
     else:
         logging.error(f'Out of the selection range, please select again!')
         sys.exit(1) 
 
 
 class USBCamera:
-    def __init__(self, device_index=0, frame_resolution=(1280, 720), frame_rate=30):
+    def __init__(self, device_index=0, frame_resolution=(1280, 720), frame_rate=30, backend='opencv',
+                 threaded_capture=False):
         """
         初始化 USB 摄像头。
 
         :param device_index: 设备索引，通常默认摄像头是 0。
         :param frame_resolution: 分辨率，以元组形式 (宽度, 高度)。
         :param frame_rate: 摄像头的帧率。
+        :param backend: 采集后端，'opencv' 或 'ffmpegcv'。
+        :param threaded_capture: 是否使用后台线程采集，仅 opencv 后端有效。默认关闭。
+                                 开启后 USB 传输与显示并行，但线程从打开到释放摄像头期间会解码每一帧，
+                                 show_live_camera 的 grab()/retrieve() 跳帧不解码优化也不再生效。
         """
         self.device_index = device_index
         self.frame_resolution = frame_resolution
         self.frame_rate = frame_rate
+        self.backend = backend
+        self.threaded_capture = threaded_capture
         self.camera = None
+        self._pending_frame = None
+        self._mjpg = False
+        self._cuda_encoder = None
+        # 打开摄像头时缓存状态与实际参数，避免每次调用都查询后端
+        self._is_open = False
+        self._w = self._h = self._fps = 0
+        self._frame_buf = None
+        # 图片异步写盘，磁盘写入与下一帧采集重叠
+        self._writer_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        # 后台采集线程与三缓冲帧环
+        self._capture_thread = None
+        self._capture_stop = threading.Event()
+        self._camera_lock = threading.Lock()
+        self._frame_cond = threading.Condition()
+        self._ring = [None, None, None]
+        self._latest_slot = -1
+        self._reading_slot = -1
+        self._frame_seq = 0
+        self._consumed_seq = 0
+        self._capture_ok = True
 
     def open_camera(self):
         """尝试打开摄像头并设置分辨率与帧率。"""
+        # 重新打开前先停止采集线程并释放旧的摄像头，避免同一设备被打开两次
+        self._stop_capture_thread()
+        if self.camera is not None:
+            self.camera.release()
+            self.camera = None
+        self._is_open = False
+        if self._writer_pool is None:
+            self._writer_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        if self.backend == 'ffmpegcv':
+            self._open_ffmpegcv_camera()
+            return
         try:
             self.camera = cv2.VideoCapture(self.device_index)
             if not self.camera.isOpened():
@@ -99,6 +372,12 @@ class USBCamera:
             # 增加延时保护
             time.sleep(1)
 
+            # 优先使用摄像头原生 MJPG 格式，USB 传输的数据量远小于 YUY2
+            self.camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+            self._mjpg = self._get_fourcc() == 'MJPG'
+            if not self._mjpg:
+                logging.warning("Camera does not support MJPG, fall back to default pixel format.")
+
             # 设置摄像头分辨率
             self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_resolution[0])
             self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_resolution[1])
@@ -107,50 +386,340 @@ class USBCamera:
             # 尝试设置自动对焦
             self.camera.set(cv2.CAP_PROP_AUTOFOCUS, 1)
 
+            # 有 CUDA 环境时使用 GPU 进行 JPEG 编码
+            if self._cuda_encoder is None and nvjpeg is not None:
+                try:
+                    self._cuda_encoder = nvjpeg.NvJpeg()
+                except Exception as e:
+                    logging.warning(f"CUDA JPEG encoder is not available: {e}")
+
+            self._w, self._h, self._fps = self._get_frame_info()
+            # 预先分配帧缓冲区，读取时直接写入，避免每帧重新分配内存
+            self._frame_buf = np.empty((self._h, self._w, 3), np.uint8)
+            # 所有初始化成功后才标记为已打开
+            self._is_open = self.camera.isOpened()
+
+            if self.threaded_capture and self._is_open:
+                self._start_capture_thread()
+
             logging.info(f"Initial Camera with configuration: index: {self.device_index}, "
                          f"resolution: {self.frame_resolution}, "
                          f"frame rate: {self.frame_rate}fps")
         except Exception as e:
             logging.error(f"Failed to open the camera: {e}")
 
-    def show_live_camera(self, timeout=60):
+    def _open_ffmpegcv_camera(self):
+        """
+        使用 ffmpegcv 打开摄像头，由 ffmpeg 子进程完成解码与色彩转换。
+        ReadLiveLast 总是返回最新一帧，自动丢弃积压的旧帧。
+        """
+        if ffmpegcv is None:
+            logging.error("ffmpegcv is not installed, please install it or use backend='opencv'.")
+            sys.exit(1)
+        # Linux 下 ffmpegcv 把整数当作其内部设备列表的序号，而不是 /dev/videoN，这里直接传设备路径
+        camera_name = f'/dev/video{self.device_index}' if sys.platform.startswith('linux') else self.device_index
+        try:
+            self.camera = ffmpegcv.ReadLiveLast(ffmpegcv.VideoCaptureCAM, camera_name,
+                                                camsize_wh=self.frame_resolution,
+                                                camfps=self.frame_rate,
+                                                pix_fmt='bgr24')
+            self._w, self._h, self._fps = self._get_frame_info()
+            self._frame_buf = np.empty((self._h, self._w, 3), np.uint8)
+            # 所有初始化成功后才标记为已打开
+            self._is_open = True
+            logging.info(f"Initial Camera with configuration: index: {self.device_index}, "
+                         f"resolution: {self.frame_resolution}, "
+                         f"frame rate: {self.frame_rate}fps, backend: ffmpegcv")
+        except Exception as e:
+            logging.error(f"Failed to open the camera: {e}")
+
+    def _start_capture_thread(self):
+        """启动后台采集线程，USB 传输耗时与画面显示并行。"""
+        if self._capture_running():
+            return
+        self._capture_thread = None
+        self._capture_stop.clear()
+        self._capture_ok = True
+        self._latest_slot = self._reading_slot = -1
+        self._consumed_seq = self._frame_seq
+        self._ring = [np.empty((self._h, self._w, 3), np.uint8) for _ in range(3)]
+        self._capture_thread = threading.Thread(target=self._capture_loop, args=(weakref.ref(self),),
+                                                daemon=True)
+        self._capture_thread.start()
+
+    def _capture_running(self):
+        """采集线程是否在运行，读取失败退出的线程视为未运行。"""
+        return self._capture_thread is not None and self._capture_thread.is_alive()
+
+    def _stop_capture_thread(self):
+        """停止后台采集线程。"""
+        if self._capture_thread is None:
+            return
+        self._capture_stop.set()
+        # 对象在采集线程中被回收时会在该线程内调用 __del__，此时不能 join 自身
+        if self._capture_thread is not threading.current_thread():
+            self._capture_thread.join(timeout=2)
+        self._capture_thread = None
+
+    @staticmethod
+    def _capture_loop(camera_ref):
+        """
+        后台采集线程，持续读取帧并写入三缓冲帧环。
+        写入时跳过最新帧与正在被读取的帧，保证读取方拿到的帧不会被覆盖。
+        线程只持有 USBCamera 的弱引用，对象被回收时线程自动退出，__del__ 仍可释放摄像头。
+        """
+        while True:
+            camera = camera_ref()
+            if camera is None or camera._capture_stop.is_set():
+                return
+            with camera._frame_cond:
+                slot = next(i for i in range(len(camera._ring))
+                            if i != camera._latest_slot and i != camera._reading_slot)
+            # 读取与发布都在 _camera_lock 内完成，切换摄像头参数后不会再发布旧参数下的帧
+            with camera._camera_lock:
+                # 实际帧尺寸与缓冲区不一致时 OpenCV 会重新分配，返回新的数组
+                ret, frame = camera.camera.read(camera._ring[slot])
+                with camera._frame_cond:
+                    if not ret:
+                        camera._capture_ok = False
+                        camera._frame_cond.notify_all()
+                        return
+                    camera._ring[slot] = frame
+                    camera._latest_slot = slot
+                    camera._frame_seq += 1
+                    camera._frame_cond.notify_all()
+            del camera
+
+    def _reset_frame_buffers(self):
+        """
+        丢弃帧环中已采集的帧并重新分配 BGR 缓冲区，用于切换输出格式之后。
+        需在持有 _camera_lock 时调用，保证采集线程不会同时发布旧格式的帧。
+        """
+        with self._frame_cond:
+            self._ring = [np.empty((self._h, self._w, 3), np.uint8) for _ in range(len(self._ring))]
+            self._latest_slot = self._reading_slot = -1
+            self._consumed_seq = self._frame_seq
+        self._frame_buf = np.empty((self._h, self._w, 3), np.uint8)
+
+    def _read_latest(self, timeout=2.0):
+        """
+        等待并获取采集线程写入的最新一帧，返回的是帧环中的缓冲区，不做拷贝。
+        该帧在下一次调用前不会被采集线程覆盖。
+        """
+        with self._frame_cond:
+            got_frame = self._frame_cond.wait_for(
+                lambda: self._frame_seq > self._consumed_seq or not self._capture_ok, timeout)
+            if not got_frame or self._frame_seq <= self._consumed_seq:
+                return False, None
+            self._consumed_seq = self._frame_seq
+            self._reading_slot = self._latest_slot
+            return True, self._ring[self._reading_slot]
+
+    def _read_frame(self):
+        """读取一帧，采集线程运行时从帧环中获取。"""
+        if self._capture_running():
+            return self._read_latest()
+        if self.backend == 'ffmpegcv':
+            # ffmpegcv 返回的帧是只读的，拷贝到可写缓冲区后才能绘制文字
+            ret, frame = self.camera.read()
+            if not ret:
+                return ret, frame
+            if self._frame_buf is None or self._frame_buf.shape != frame.shape:
+                self._frame_buf = np.empty_like(frame)
+            np.copyto(self._frame_buf, frame)
+            return ret, self._frame_buf
+        if self._frame_buf is not None:
+            return self.camera.read(self._frame_buf)
+        return self.camera.read()
+
+    def _get_frame_info(self):
+        """获取摄像头实际的分辨率与帧率。"""
+        if self.backend == 'ffmpegcv':
+            # ffmpegcv 的摄像头读取器不提供 fps，使用配置的帧率
+            return self.camera.width, self.camera.height, int(self.camera.fps or self.frame_rate)
+        return (int(self.camera.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(self.camera.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                int(self.camera.get(cv2.CAP_PROP_FPS)))
+
+    def _grab(self):
+        """抓取一帧。ffmpegcv 后端或采集线程运行时解码已在后台完成，这里直接读取并缓存。"""
+        if self.backend == 'ffmpegcv' or self._capture_running():
+            ret, self._pending_frame = self._read_frame()
+            return ret
+        return self.camera.grab()
+
+    def _retrieve(self):
+        """解码 _grab() 抓取的帧。"""
+        if self.backend == 'ffmpegcv' or self._capture_running():
+            return self._pending_frame is not None, self._pending_frame
+        return self.camera.retrieve(self._frame_buf)
+
+    def _raw_to_gray(self, raw):
+        """
+        从摄像头原始数据中取出 Y 分量作为灰度图，不做色彩转换。
+        YUYV 中 Y 为隔字节排列，NV12 的前 W*H 字节即为 Y 平面。
+        """
+        if raw.ndim == 3 and raw.shape[2] == 3:    # 切换格式前缓存的 BGR 帧
+            return cv2.cvtColor(raw, cv2.COLOR_BGR2GRAY)
+        data = raw.reshape(-1)
+        if data.size == self._w * self._h * 2:
+            return data.reshape(self._h, self._w, 2)[:, :, 0]
+        return data[:self._w * self._h].reshape(self._h, self._w)
+
+    def _get_fourcc(self):
+        """获取摄像头当前协商的像素格式, 例如 'MJPG' / 'YUYV'。"""
+        fourcc = int(self.camera.get(cv2.CAP_PROP_FOURCC))
+        return ''.join(chr((fourcc >> 8 * i) & 0xFF) for i in range(4))
+
+    def _read_raw_jpeg(self):
+        """
+        直接读取摄像头输出的 MJPEG 原始数据，不做解码。
+        :return: JPEG 字节流，不支持或不是完整 JPEG 时返回 None
+        """
+        if not self._mjpg:
+            return None
+        # 与采集线程互斥访问摄像头
+        with self._camera_lock:
+            try:
+                self.camera.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+                ret, buf = self.camera.read()
+            finally:
+                self.camera.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+        if not ret or buf is None:
+            return None
+        data = buf.tobytes()
+        # 后端不支持输出原始数据时，返回的不是 JPEG 数据
+        if not data.startswith(b'\xff\xd8'):
+            return None
+        # 很多 UVC 摄像头的 MJPEG 帧省略了 Huffman 表，不能作为独立的 JPEG 文件保存
+        if not jpeg_has_huffman_tables(data):
+            return None
+        return data
+
+    def show_live_camera(self, timeout=60, preview_fps=30, display_backend='opencv', gray_preview=False):
         """
         检测指定 camera 状态，并有 60 秒画面出图，进行镜头位置调整
+        每次循环只 grab() 推进视频流，仅在需要刷新画面时才 retrieve() 解码，跳过的帧不做解码与拷贝
+        (threaded_capture 开启时帧由后台线程解码，这里直接取最新帧)
+        :param timeout: 预览时长，单位秒
+        :param preview_fps: 预览窗口刷新帧率，人眼观察 15-30fps 即可
+        :param display_backend: 预览窗口，'opencv' 使用 HighGUI，'sdl2' 使用 SDL2 纹理直接显示
+        :param gray_preview: 仅显示 Y 分量灰度画面，跳过 YUV 到 BGR 的转换，需摄像头输出 YUYV/NV12
         :return: None
         """
-        act_frame_width = int(self.camera.get(cv2.CAP_PROP_FRAME_WIDTH))
-        act_frame_height = int(self.camera.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        act_frame_fps = int(self.camera.get(cv2.CAP_PROP_FPS))
+        if not self._is_open:
+            logging.error(f"Can not receive camera_id:{self.device_index} frame, camera is not opened.")
+            return
+        act_frame_width, act_frame_height, act_frame_fps = self._w, self._h, self._fps
         print(f"Actual camera info: {act_frame_width}x{act_frame_height}@{act_frame_fps}fps")
+        display_interval = 1.0 / preview_fps
+        window = None
+        if display_backend == 'sdl2':
+            if sdl2 is not None:
+                try:
+                    window = SDLPreviewWindow('frame', act_frame_width, act_frame_height)
+                except RuntimeError as e:
+                    logging.warning(f"Failed to initialize SDL2 video, fall back to OpenCV HighGUI window: {e}")
+            else:
+                logging.warning("PySDL2 is not installed, fall back to OpenCV HighGUI window.")
+        fourcc = None
+        if gray_preview and self.backend == 'opencv' and window is None:
+            # 与采集线程互斥访问摄像头
+            with self._camera_lock:
+                fourcc = self._get_fourcc()
+        if gray_preview and fourcc not in ('YUYV', 'YUY2', 'NV12'):
+            logging.warning("Gray preview needs YUYV/NV12 format and OpenCV window, fall back to color preview.")
+            gray_preview = False
+        # 所有文字绘制到刚好容纳文字的左上角 overlay 上，每帧只覆盖该区域一次；倒计时每秒才重绘一次
+        texts = [(f'Camera ID: {self.device_index}', (25, 40), 1, 2),
+                 (f"Frame Info: {act_frame_width}x{act_frame_height}@{act_frame_fps}fps", (25, 80), 0.8, 1),
+                 (f'Enter "q" to close windows', (25, 160), 0.8, 1)]
+        layer_width, layer_height = 0, 0
+        for text, (x, y), scale, thickness in texts + [("Countdown Clock: 00:00", (25, 120), 0.8, 1)]:
+            (text_width, _), text_baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+            layer_width = max(layer_width, x + text_width + 4)
+            layer_height = max(layer_height, y + text_baseline + 4)
+        layer_width, layer_height = min(layer_width, act_frame_width), min(layer_height, act_frame_height)
+        overlay = np.zeros((layer_height, layer_width, 3), np.uint8)
+        for text, org, scale, thickness in texts:
+            cv2.putText(overlay, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, (0, 0, 255), thickness, cv2.LINE_AA)
+        mask = overlay.any(axis=2)
+        # 预先编译 overlay 合成函数（目标为帧的切片视图），避免首帧卡顿
+        composite_overlay(np.zeros((2, 2, 3), np.uint8)[:1, :1], np.zeros((1, 1, 3), np.uint8),
+                          np.zeros((1, 1), np.bool_))
+        if gray_preview:
+            composite_overlay(np.zeros((2, 2), np.uint8)[:1, :1], np.zeros((1, 1, 3), np.uint8)[:, :, 2],
+                              np.zeros((1, 1), np.bool_))
+            # 关闭 BGR 转换，直接获取摄像头原始 YUV 数据
+            with self._camera_lock:
+                self.camera.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+        # 倒计时文字所在的行范围
+        (_, text_height), baseline = cv2.getTextSize("Countdown Clock: 00:00", cv2.FONT_HERSHEY_SIMPLEX, 0.8, 1)
+        clock_rows = slice(120 - text_height - 2, 120 + baseline + 2)
+        last_sec = -1
         start_time = time.time()
-        while True:
-            # 计算剩余的倒计时时间，使用 60 进制
-            elapsed_time = time.time() - start_time
-            remaining_time = max(0, int(timeout - elapsed_time))
-            remaining_minute = remaining_time // 60
-            remaining_second = remaining_time % 60
-            countdown_clock = f"Countdown Clock: {remaining_minute:02d}:{remaining_second:02d}"
-            # 读取图像
-            ret, frame = self.camera.read()
-            if not ret:     # 判断是否可以收到 camera frame，不能接收报错退出
-                self.camera.release()
-                logging.error(f"Can not receive camera_id:{self.device_index} frame")
-                sys.exit(1)
-            # 在帧上添加文本
-            cv2.putText(frame, f'Camera ID: {self.device_index}', (25, 40),
-                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2, cv2.LINE_AA)
-            cv2.putText(frame, f"Frame Info: {act_frame_width}x{act_frame_height}@{act_frame_fps}fps", (25, 80),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 1, cv2.LINE_AA)
-            cv2.putText(frame, countdown_clock, (25, 120),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 1, cv2.LINE_AA)
-            cv2.putText(frame, f'Enter "q" to close windows', (25, 160),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 1, cv2.LINE_AA)
-            cv2.imshow('frame', frame)
-            # 时间超时关闭
-            if cv2.waitKey(1) == ord('q') or elapsed_time > timeout:
-                break
-        cv2.destroyAllWindows()
-        cv2.waitKey(1)
+        last_display = 0.0
+        try:
+            while True:
+                # 只抓取帧，不解码
+                if not self._grab():     # 判断是否可以收到 camera frame，不能接收报错退出
+                    self.release_camera()
+                    logging.error(f"Can not receive camera_id:{self.device_index} frame")
+                    sys.exit(1)
+                now = time.time()
+                elapsed_time = now - start_time
+                if now - last_display > display_interval:
+                    last_display = now
+                    # 解码当前帧
+                    ret, frame = self._retrieve()
+                    if not ret:
+                        self.release_camera()
+                        logging.error(f"Can not receive camera_id:{self.device_index} frame")
+                        sys.exit(1)
+                    # 计算剩余的倒计时时间，使用 60 进制，秒数变化时才重新生成倒计时文字
+                    remaining_time = max(0, int(timeout - elapsed_time))
+                    if remaining_time != last_sec:
+                        last_sec = remaining_time
+                        remaining_minute, remaining_second = divmod(remaining_time, 60)
+                        countdown_clock = f"Countdown Clock: {remaining_minute:02d}:{remaining_second:02d}"
+                        overlay[clock_rows] = 0
+                        cv2.putText(overlay, countdown_clock, (25, 120),
+                                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 1, cv2.LINE_AA)
+                        mask[clock_rows] = overlay[clock_rows].any(axis=2)
+                    if gray_preview:
+                        frame = self._raw_to_gray(frame)
+                    # 在帧左上角添加文本，只写 overlay 大小的区域
+                    if frame.shape[0] >= layer_height and frame.shape[1] >= layer_width:
+                        if gray_preview:
+                            composite_overlay(frame[:layer_height, :layer_width], overlay[:, :, 2], mask)
+                        else:
+                            composite_overlay(frame[:layer_height, :layer_width], overlay, mask)
+                    if window is not None:
+                        window.show(frame)
+                    else:
+                        cv2.imshow('frame', frame)
+                # pollKey 只处理窗口事件不阻塞，旧版本 OpenCV 退回 waitKey(1)
+                if window is not None:
+                    key = window.poll_key()
+                elif hasattr(cv2, 'pollKey'):
+                    key = cv2.pollKey()
+                else:
+                    key = cv2.waitKey(1)
+                # 时间超时关闭
+                if key == ord('q') or elapsed_time > timeout:
+                    break
+        finally:
+            # 恢复 BGR 输出，拍照仍使用彩色图像
+            if gray_preview and self._is_open:
+                with self._camera_lock:
+                    self.camera.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+                    self._reset_frame_buffers()
+            # 出错退出时也要关闭预览窗口
+            if window is not None:
+                window.close()
+            else:
+                cv2.destroyAllWindows()
+                cv2.waitKey(1)
 
     def take_picture(self, save_path=None, test_case_name=None, count=None, pic_mark=False):
         """
@@ -161,41 +730,81 @@ class USBCamera:
         :param pic_mark: 照片左上角添加水印，默认是不启动
         :return: None
         """
-        if self.camera is None or not self.camera.isOpened():
+        if not self._is_open:
             logging.warning("Camera is not opened. Trying to open it...")
             self.open_camera()
+            if not self._is_open:
+                logging.error(f"Can not open camera_id:{self.device_index}, picture is not taken.")
+                return
 
         try:
-            ret, frame = self.camera.read()
+            # 不加水印时直接保存摄像头输出的 MJPEG 数据，省去解码与重新编码
+            if not pic_mark:
+                jpeg_bytes = self._read_raw_jpeg()
+                if jpeg_bytes is not None:
+                    now_time = time.strftime("%Y%m%d_%H%M%S")
+                    filename = os.path.join(save_path, f"{test_case_name}_{now_time}_{count}.jpg")
+                    self._submit_write(filename, jpeg_bytes)
+                    return
+
+            ret, frame = self._read_frame()
             if ret:
                 # 获取当前时间并格式化为字符串
                 now_time = time.strftime("%Y%m%d_%H%M%S")
                 filename = os.path.join(save_path, f"{test_case_name}_{now_time}_{count}.jpg")
-                cv2.imwrite(filename, frame, [cv2.IMWRITE_JPEG_QUALITY, 95])
-                logging.info(f"Image saved as: {test_case_name}_{now_time}_{count}.jpg")
+                # 水印直接绘制在内存中的帧上，只编码保存一次
                 if pic_mark:
-                    self.add_pic_mark(filename, f"{test_case_name}_{now_time}_{count}")
+                    self._draw_pic_mark(frame, f"{test_case_name}_{now_time}_{count}")
+                # 在当前线程编码，写盘交给后台线程
+                jpeg_bytes = encode_jpeg(frame, quality=95, gpu_encoder=self._cuda_encoder)
+                self._submit_write(filename, jpeg_bytes)
             else:
                 logging.warning("Failed to capture image from camera.")
         except Exception as e:
             logging.error(f"Error capturing and saving image: {e}")
 
+    def _submit_write(self, filename, jpeg_bytes):
+        """提交图片到后台线程写盘，线程池不可用时同步写入。"""
+        if self._writer_pool is not None:
+            self._writer_pool.submit(self._write_picture, filename, jpeg_bytes)
+        else:
+            self._write_picture(filename, jpeg_bytes)
+
+    @staticmethod
+    def _write_picture(filename, jpeg_bytes):
+        """将 JPEG 数据写入文件。"""
+        try:
+            atomic_write(filename, jpeg_bytes)
+            logging.info(f"Image saved as: {os.path.basename(filename)}")
+        except Exception as e:
+            logging.error(f"Error saving image {filename}: {e}")
+
     def add_pic_mark(self, file_path, text):
         """
-        照片添加水印功能
+        照片添加水印功能，用于给已保存的照片补加水印
         :param file_path: 照片路径
         :param text: 需要添加的文字
         :return: None
         """
-        pic = cv2.imread(file_path)
+        pic = load_jpeg(file_path)
+        self._draw_pic_mark(pic, text)
+        save_jpeg(file_path, pic, gpu_encoder=self._cuda_encoder)
+
+    def _draw_pic_mark(self, pic, text):
+        """在图像左上角绘制水印文字。"""
         cv2.putText(pic, f'Camera ID: {self.device_index}', (25, 40),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 1, cv2.LINE_AA)
         cv2.putText(pic, f"{text}", (25, 80),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 1, cv2.LINE_AA)
-        cv2.imwrite(file_path, pic)
 
     def release_camera(self):
         """释放摄像头资源。"""
+        self._stop_capture_thread()
+        # 等待所有图片写盘完成
+        if self._writer_pool is not None:
+            self._writer_pool.shutdown(wait=True)
+            self._writer_pool = None
+        self._is_open = False
         if self.camera:
             self.camera.release()
             logging.info("Camera resources have been released.")